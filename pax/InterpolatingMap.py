@@ -1,6 +1,7 @@
 import logging
 import gzip
 import json
+from operator import attrgetter
 import re
 
 import numpy as np
@@ -32,10 +33,26 @@ class InterpolateAndExtrapolate(object):
         if np.any(np.isnan(args)):
             return np.nan
         distances, indices = self.kdtree.query(args, self.neighbours_to_use)
-        # We are not ruturning sum of weight when using np.average
-        return np.average(self.values[indices], weights=1/np.clip(distances, 1e-6, float('inf')))
+        # Weighted average of the neighbours' values. np.average does the same, but with a lot of per-call overhead
+        weights = 1 / np.clip(distances, 1e-6, float('inf'))
+        return np.dot(self.values[indices], weights) / np.sum(weights)
 
-    #v__call__ = np.vectorize(__call__, signature = '(),(i)->()')
+    def interpolate_many(self, points):
+        """Interpolate at many points at once, given as an (N, dimensions) array. Returns array of N values.
+        Points with a NaN coordinate give NaN.
+        """
+        points = np.asarray(points, dtype=np.float64)
+        result = np.full(len(points), np.nan)
+        valid = ~np.any(np.isnan(points), axis=1)
+        if not np.any(valid):
+            return result
+        distances, indices = self.kdtree.query(points[valid], self.neighbours_to_use)
+        # Ensure (N, neighbours) shape even when using a single neighbour
+        distances = distances.reshape(len(indices), -1)
+        indices = indices.reshape(len(indices), -1)
+        weights = 1 / np.clip(distances, 1e-6, float('inf'))
+        result[valid] = np.sum(self.values[indices] * weights, axis=1) / np.sum(weights, axis=1)
+        return result
 
 
 class InterpolatingMap(object):
@@ -68,28 +85,40 @@ class InterpolatingMap(object):
 
         if filename.endswith('.gz'):
             bla = gzip.open(filename).read()
-            self.data = json.loads(bla.decode())
+            data = json.loads(bla.decode())
         else:
             with open(filename) as data_file:
-                self.data = json.load(data_file)
-        self.coordinate_system = cs = self.data['coordinate_system']
+                data = json.load(data_file)
+
+        # Convert the coordinates and maps to numpy arrays right away, and don't keep the (much larger) parsed json
+        self.coordinate_system = cs = np.array(data['coordinate_system'], dtype=np.float64)
         if not len(cs):
             self.dimensions = 0
         else:
             self.dimensions = len(cs[0])
+        # Fetches the coordinates get_value_at needs from a position, as a tuple
+        position_names = ['x', 'y', 'z'][:self.dimensions]
+        if len(position_names) == 1:
+            # attrgetter with one attribute returns a bare value, not a 1-tuple
+            self._get_coordinates = lambda position: (getattr(position, position_names[0]),)
+        elif len(position_names):
+            self._get_coordinates = attrgetter(*position_names)
+        else:
+            self._get_coordinates = lambda position: tuple()
         self.interpolators = {}
-        self.map_names = sorted([k for k in self.data.keys() if k not in self.data_field_names])
-        self.log.debug('Map name: %s' % self.data['name'])
-        self.log.debug('Map description:\n    ' + re.sub(r'\n', r'\n    ', self.data['description']))
+        self.map_names = sorted([k for k in data.keys() if k not in self.data_field_names])
+        self.log.debug('Map name: %s' % data['name'])
+        self.log.debug('Map description:\n    ' + re.sub(r'\n', r'\n    ', data['description']))
         self.log.debug("Map names found: %s" % self.map_names)
 
         for map_name in self.map_names:
-            map_data = np.array(self.data[map_name])
+            map_data = np.array(data.pop(map_name), dtype=np.float64)
             if self.dimensions == 0:
                 # 0 D -- placeholder maps which take no arguments and always return a single value
-                itp_fun = lambda *args: map_data  # flake8: noqa
+                # (bind map_data now, otherwise all 0d maps in the file would return the last one's value)
+                itp_fun = (lambda value: lambda *args: value)(map_data)  # flake8: noqa
             else:
-                itp_fun = InterpolateAndExtrapolate(points=np.array(cs), values=np.array(map_data))
+                itp_fun = InterpolateAndExtrapolate(points=cs, values=map_data)
 
             self.interpolators[map_name] = itp_fun
 
@@ -97,9 +126,7 @@ class InterpolatingMap(object):
         """Returns the value of the map map_name at a ReconstructedPosition
          position - pax.datastructure.ReconstructedPosition instance
         """
-        position_names = ['x', 'y', 'z']
-        return self.get_value(*[getattr(position, q) for q in position_names[:self.dimensions]],
-                              map_name=map_name)
+        return self.get_value(*self._get_coordinates(position), map_name=map_name)
 
     # get_value accepts only the map_name keyword argument, but we have to let it accept
     # **kwargs, otherwise python 2 will freak out...
@@ -114,19 +141,18 @@ class InterpolatingMap(object):
                 raise ValueError("InterpolatingMap.get_value only takes map_name keyword argument")
 
         map_name = kwargs.get('map_name', 'map')
-        if True: #len(np.array(coordinates).shape) <= 1:
-            result = self.interpolators[map_name](coordinates)
-            try:
-                return float(result[0])
-            except(TypeError, IndexError):
-                return float(result)
-
-        # Following part is not in use due to couldn't implement np.vectorize for numpy<1.12
-        else:
-            coordinates = np.array(coordinates).reshape((self.dimensions,-1)).T
-            result = self.interpolators[map_name].v__call__(self.interpolators[map_name], coordinates)
-
-            if len(result) == 1:
-                return float(result[0])
-            else:
-                return result
+        result = self.interpolators[map_name](coordinates)
+        try:
+            return float(result[0])
+        except(TypeError, IndexError):
+            return float(result)
+
+    def get_values(self, positions, map_name='map'):
+        """Returns array of values of the map map_name at many positions at once
+         positions - (N, dimensions) array of coordinates
+        Use this instead of calling get_value in a loop if you have many positions.
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, max(self.dimensions, 1))
+        if self.dimensions == 0:
+            return np.full(len(positions), float(self.interpolators[map_name]()))
+        return self.interpolators[map_name].interpolate_many(positions)
@@ -24,7 +24,12 @@ class ClientMaker:
 
     On __init__, you can specify options that will be used to format mongodb uri's,
     in particular user, password, host and port.
+
+    pymongo clients are cached per process and uri, so plugins connecting to the same database share one client
+    (and its connection pool) instead of each doing their own server discovery. MongoClient is thread-safe.
     """
+    _cached_clients = {}
+
     def __init__(self, config):
         if 'password' not in config:
             config['password'] = os.environ.get('MONGO_PASSWORD')
@@ -34,13 +39,16 @@ class ClientMaker:
         self.config = {k: config[k] for k in ('user', 'password', 'host', 'port')}
         self.log = logging.getLogger('Mongo client maker')
 
-    def get_client(self, database_name=None, uri=None, monary=False, host=None, autoreconnect=False, **kwargs):
+    def get_client(self, database_name=None, uri=None, monary=False, host=None, autoreconnect=False, reuse=True,
+                   **kwargs):
         """Get a Mongoclient. Returns Mongo database object.
         If you provide a mongodb connection string uri, we will insert user & password into it,
         otherwise one will be built from the configuration settings.
         If database_name=None, will connect to the default database of the uri. database=something
         overrides event the uri's specification of a database.
         host is special magic for split_hosts
+        If reuse=False, always make a new pymongo client (e.g. to replace a broken one).
+        Monary clients are never reused.
         kwargs will be passed to pymongo.mongoclient/Monary
         """
         # Format of URI we should eventually send to mongo
@@ -74,6 +82,11 @@ class ClientMaker:
             return client
 
         else:
+            # Include the pid in the key: clients must not be shared with forked processes
+            cache_key = (os.getpid(), uri, autoreconnect, tuple(sorted(kwargs.items())))
+            if reuse and cache_key in self._cached_clients:
+                return self._cached_clients[cache_key]
+
             # Be careful enabling this debug log statement, it's useful but prints the password in the uri
             # self.log.debug("Connecting to Mongo using uri %s" % uri)
             client = pymongo.MongoClient(uri, **kwargs)
@@ -84,6 +97,7 @@ class ClientMaker:
                 # Wrap the client in a magic object that retries autoreconnect exceptions
                 client = MongoProxy(client, disconnect_on_timeout=False, wait_time=180)
 
+            self._cached_clients[cache_key] = client
             return client
 
 
@@ -95,8 +109,8 @@ class PersistentRunsDBConnection:
         self.clientmaker = ClientMaker(clientmaker_config)
         self._connect()
 
-    def _connect(self):
-        self.client = self.clientmaker.get_client('run', autoreconnect=True)
+    def _connect(self, reuse=True):
+        self.client = self.clientmaker.get_client('run', autoreconnect=True, reuse=reuse)
         self.db = self.client['run']
         self.collection = self.db['runs_new']
         self.pipeline_status_collection = self.db['pipeline_status']
@@ -112,7 +126,7 @@ class PersistentRunsDBConnection:
                 self.log.fatal("Exception pinging runs db: %s: %s" % (type(e), str(e)))
 
                 try:
-                    self._connect()
+                    self._connect(reuse=False)
                 except Exception as e:
                     self.log.fatal("Could not re-acquire runs db connection: %s %s. Trying again in ten seconds." % (
                         type(e), str(e)))
@@ -677,6 +677,14 @@ class Event(StrictModel):
     #: Number of hits rejected per channel in the suspicious channel algorithm
     n_hits_rejected = np.array([], dtype=np.int16)
 
+    # (field name, dtype) of the per-channel arrays initialized in __init__
+    _per_channel_fields = (('n_pulses_per_channel', np.int16),
+                           ('noise_pulses_in', np.int16),
+                           ('n_hits_rejected', np.int16),
+                           ('is_channel_suspicious', np.bool),
+                           ('lone_hits_per_channel_before', np.int16),
+                           ('lone_hits_per_channel', np.int16))
+
     def __init__(self, n_channels, start_time, **kwargs):
 
         # Start time is mandatory, so it is not in kwargs
@@ -686,11 +694,13 @@ class Event(StrictModel):
         # Model's init must be called first, else we can't store attributes
         # This will store all of the kwargs as attrs
         # We don't pass length, it's not an attribute that can be set
-        StrictModel.__init__(self, **{k: v for k, v in kwargs.items() if k != 'length'})
+        # (kwargs is our own dict, so we can just pop it rather than copying the other kwargs)
+        length = kwargs.pop('length', None)
+        StrictModel.__init__(self, **kwargs)
 
         # Cheat to init stop_time from length and duration
-        if 'length' in kwargs and self.sample_duration and not self.stop_time:
-            self.stop_time = int(self.start_time + kwargs['length'] * self.sample_duration)
+        if length is not None and self.sample_duration and not self.stop_time:
+            self.stop_time = int(self.start_time + length * self.sample_duration)
 
         if not self.stop_time or not self.sample_duration:
             raise ValueError("Cannot initialize an event with an unknown length: " +
@@ -700,12 +710,10 @@ class Event(StrictModel):
             raise ValueError("Nonpositive event duration %s!" % self.duration())
 
         # Initialize numpy arrays -- need to have n_channels and self.length
-        self.n_pulses_per_channel = np.zeros(n_channels, dtype=np.int16)
-        self.noise_pulses_in = np.zeros(n_channels, dtype=np.int16)
-        self.n_hits_rejected = np.zeros(n_channels, dtype=np.int16)
-        self.is_channel_suspicious = np.zeros(n_channels, dtype=np.bool)
-        self.lone_hits_per_channel_before = np.zeros(n_channels, dtype=np.int16)
-        self.lone_hits_per_channel = np.zeros(n_channels, dtype=np.int16)
+        # These are created with their declared dtype, so we can bypass StrictModel's type checking
+        # (as Model.__init__ does for list fields). This constructor runs for every event.
+        for field_name, dtype in self._per_channel_fields:
+            object.__setattr__(self, field_name, np.zeros(n_channels, dtype=dtype))
 
     @classmethod
     def empty_event(cls):
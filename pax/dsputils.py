@@ -179,53 +179,49 @@ def find_intervals_above_threshold(w, threshold, result_buffer):
     Boundary indices are inclusive, i.e. the right boundary is the last index which was > threshold
     """
     result_buffer_size = len(result_buffer)
-    last_index_in_w = len(w) - 1
-
-    in_interval = False
-    current_interval = 0
-    current_interval_start = -1
-
-    for i, x in enumerate(w):
-
-        if not in_interval and x > threshold:
-            # Start of an interval
-            in_interval = True
-            current_interval_start = i
-
-        if in_interval and (x <= threshold or i == last_index_in_w):
-            # End of the current interval
-            in_interval = False
 
-            # The interval ended just before this index
-            # Unless we ended ONLY because this is the last index, then the interval ends right here
-            itv_end = i - 1 if x <= threshold else i
+    # Find the threshold crossings. Pad with False on both sides, so intervals touching the edges are found too.
+    above = np.concatenate(([False], w > threshold, [False])).astype(np.int8)
+    crossings = np.diff(above)
+    starts = np.flatnonzero(crossings == 1)
+    ends = np.flatnonzero(crossings == -1) - 1
 
-            # Split interval if the interval >350 samples
-            # Use lowess to smooth raw waveform and split at relative minima.
-            if itv_end - current_interval_start > 350:
-                broader_interval_start = current_interval_start
+    if not np.any(ends - starts > 350):
+        # No intervals to split: we can fill the result buffer in one go
+        n_intervals = min(len(starts), result_buffer_size)
+        result_buffer[:n_intervals, 0] = starts[:n_intervals]
+        result_buffer[:n_intervals, 1] = ends[:n_intervals]
+        return n_intervals
 
-                _w = w[broader_interval_start:itv_end].copy()
-                conv = np.ones(100)/100
-                _w = np.convolve(_w, conv, 'same')
-                dw = _w[1:] - _w[:-1]
-                for j in np.where((np.hstack((dw, -1)) > 0) & (np.hstack((1, dw)) <= 0))[0]:
-                    result_buffer[current_interval, 0] = current_interval_start
-                    result_buffer[current_interval, 1] = j+broader_interval_start
-
-                    current_interval_start = j+broader_interval_start+1
-                    current_interval += 1
-
-                    if current_interval == result_buffer_size:
-                        return current_interval
-
-            # Add bounds to result buffer
-            result_buffer[current_interval, 0] = current_interval_start
-            result_buffer[current_interval, 1] = itv_end
-            current_interval += 1
-
-            if current_interval == result_buffer_size:
-                return current_interval
+    current_interval = 0
+    for current_interval_start, itv_end in zip(starts, ends):
+
+        # Split interval if the interval >350 samples
+        # Use lowess to smooth raw waveform and split at relative minima.
+        if itv_end - current_interval_start > 350:
+            broader_interval_start = current_interval_start
+
+            _w = w[broader_interval_start:itv_end].copy()
+            conv = np.ones(100)/100
+            _w = np.convolve(_w, conv, 'same')
+            dw = _w[1:] - _w[:-1]
+            for j in np.where((np.hstack((dw, -1)) > 0) & (np.hstack((1, dw)) <= 0))[0]:
+                result_buffer[current_interval, 0] = current_interval_start
+                result_buffer[current_interval, 1] = j+broader_interval_start
+
+                current_interval_start = j+broader_interval_start+1
+                current_interval += 1
+
+                if current_interval == result_buffer_size:
+                    return current_interval
+
+        # Add bounds to result buffer
+        result_buffer[current_interval, 0] = current_interval_start
+        result_buffer[current_interval, 1] = itv_end
+        current_interval += 1
+
+        if current_interval == result_buffer_size:
+            return current_interval
 
     n_intervals = current_interval      # No +1, as current_interval was incremented also when the last interval closed
     return n_intervals
@@ -347,10 +347,12 @@ class FindPeaks(plugin.TransformPlugin):
 
             # Find the free regions - regions where peaks haven't yet been found
             # We could move this to the event class...
-            lefts = sorted([0] + [p.left for p in event.peaks])
-            rights = sorted([p.right for p in event.peaks] + [event.length() - 1])
-            # Assuming each peak's right > left, we can simply split sorted(lefts+rights) in pairs:
-            free_regions = list(zip(*[iter(sorted(lefts + rights))] * 2))
+            lefts = np.sort(np.array([p.left for p in event.peaks], dtype=np.int64))
+            rights = np.sort(np.array([p.right for p in event.peaks], dtype=np.int64))
+            # Assuming peaks don't overlap, each free region runs from one peak's right to the next peak's left,
+            # so we can pair up the sorted bounds directly instead of sorting all of them together:
+            free_regions = np.column_stack((np.concatenate(([0], rights)),
+                                            np.concatenate((lefts, [event.length() - 1])))).tolist()
             self.log.debug("Free regions: " + str(free_regions))
 
             # Construct search regions from the free regions
@@ -640,7 +642,7 @@ class FindPeaks(plugin.TransformPlugin):
 
             # Test for aspect ratio of the UNFILTERED WAVEFORM, probably to avoid misidentifying s1s as small s2s
             unfiltered_signal = event.get_sum_waveform('uS2').samples
-            height_for_aspect_ratio_test = unfiltered_signal[left + int(np.argmax(unfiltered_signal[left:right + 1]))]
+            height_for_aspect_ratio_test = np.max(unfiltered_signal[left:right + 1])
             aspect_ratio_threshold = settings['aspect_ratio_threshold']
             peak_width = right - left
             aspect_ratio = height_for_aspect_ratio_test / peak_width
@@ -859,21 +861,35 @@ class ComputePeakProperties(plugin.TransformPlugin):
 
     """
 
+    def startup(self):
+        # Channel masks and per-channel coincidence thresholds, so we don't have to loop over channels for each peak
+        n_channels = self.config['n_channels']
+        self.is_tpc_channel = np.zeros(n_channels, dtype=np.bool)
+        self.is_tpc_channel[list(self.config['channels_in_detector']['tpc'])] = True
+        self.is_s1_channel = self.is_tpc_channel.copy()
+        self.is_s1_channel[list(self.config['channels_excluded_for_s1'])] = False
+
+        # Channels with gain 0 never contribute
+        if len(self.config['gains']) < n_channels:
+            raise exceptions.InvalidConfigurationError("Only %d gains given for %d channels" % (
+                len(self.config['gains']), n_channels))
+        gains = np.array(self.config['gains'][:n_channels], dtype=np.float64)
+        self.coincidence_area_threshold = np.full(n_channels, float('inf'))
+        self.coincidence_area_threshold[gains != 0] = \
+            self.config['coincidence_threshold'] * (2 * 10 ** 6 / gains[gains != 0])
+
     def transform_event(self, event):
         """Only computes area for Xerawdp matching at the moment
         """
 
         # Compute relevant peak quantities for each pmt's peak: height, FWHM, FWTM, area, ..
         for peak in event.peaks:
-            peak.area_per_channel = np.zeros(len(event.channel_waveforms), dtype='float64')
-            for channel, wave_data in enumerate(event.channel_waveforms):
-                if channel not in self.config['channels_in_detector']['tpc'] or \
-                   peak.type == 's1' and channel in self.config['channels_excluded_for_s1']:
-                    continue
-                # No +1, Xerawdp forgets the right edge also:
-                peak.area_per_channel[channel] = np.sum(wave_data[peak.left:peak.right])
+            channel_mask = self.is_s1_channel if peak.type == 's1' else self.is_tpc_channel
+            # No +1, Xerawdp forgets the right edge also:
+            peak.area_per_channel = np.sum(event.channel_waveforms[:, peak.left:peak.right], axis=1)
+            peak.area_per_channel[True ^ channel_mask] = 0
             # Exclude negative areas
-            peak.area = sum([area for _, area in enumerate(peak.area_per_channel) if area > 0])
+            peak.area = np.sum(peak.area_per_channel[peak.area_per_channel > 0])
             """
             The coincidence level is actually computed twice in Xerawdp: once before and once after gain correction
             The coincidence computed before gain correction is used for sorting
@@ -883,18 +899,7 @@ class ComputePeakProperties(plugin.TransformPlugin):
 
             """
             if peak.type == 's1':
-                contributing_pmts = []
-                for channel, area in enumerate(peak.area_per_channel):
-                    if channel not in self.config['channels_in_detector']['tpc'] \
-                            or channel in self.config['channels_excluded_for_s1']:
-                        continue
-                    if self.config['gains'][channel] == 0:
-                        continue
-                    if area > self.config['coincidence_threshold'] * (2 * 10 ** 6 / self.config['gains'][channel]):
-                        contributing_pmts.append(channel)
-                does_channel_contribute = np.array(
-                    [ch in contributing_pmts for ch in range(self.config['n_channels'])],
-                    dtype=np.bool)
+                does_channel_contribute = self.is_s1_channel & (peak.area_per_channel > self.coincidence_area_threshold)
             else:
                 # Hack to ensure S2s won't get pruned:
                 does_channel_contribute = np.ones(self.config['n_channels'], dtype=np.bool)
@@ -921,10 +926,15 @@ class ComputePeakProperties(plugin.TransformPlugin):
 
 log = logging.getLogger('PeakFinding_find_next_crossing')
 
+# XeRawDP's '9-tap derivative kernel', used for the slope inversion check in large s2 peakfinding
+XERAWDP_DERIVATIVE_KERNEL = np.array([-0.003059, -0.035187, -0.118739, -0.143928, 0.000000,
+                                      0.143928, 0.118739, 0.035187, 0.003059])
+
 
 def find_next_crossing(signal, threshold,
                        start=0, direction='right', min_length=1,
-                       stop=None, stop_if_start_exceeded=False, activate_xerawdp_hacks_for=None):
+                       stop=None, stop_if_start_exceeded=False, activate_xerawdp_hacks_for=None,
+                       vectorized=True):
     """Returns first index in signal crossing threshold, searching from start in direction
     A 'crossing' is defined as a point where:
         start_sample < threshold < this_sample OR start_sample > threshold > this_sample
@@ -941,6 +951,8 @@ def find_next_crossing(signal, threshold,
     #Hack for Xerawdp matching:
     stop_if_start_exceeded      -- If true and a value HIGHER than start is encountered, stop immediately
     activate_xerawdp_hacks_for  -- Activates several hacks, for instance, slope checking for large s2
+    vectorized        --  If False, always step through the signal sample by sample, even when no hacks are active
+                          and min_length is 1. The results must be the same, this is only for testing.
 
     This is a pretty crucial function for several DSP routines; as such, it does extensive checking for
     pathological cases. Please be very careful in making changes to this function, their effects could
@@ -998,6 +1010,17 @@ def find_next_crossing(signal, threshold,
                      "to occur in it. Will return %s as the crossing position. See issue #68.") % stop)
         return stop
 
+    # Sane case: any single sample on the other side of the threshold counts, no hacks.
+    # Scan with vectorized comparisons rather than stepping through the signal sample by sample.
+    if vectorized and activate_xerawdp_hacks_for is None and min_length == 1 and not stop_if_start_exceeded:
+        below = signal[start] > threshold
+        if direction == 'right':
+            i = find_first_fast(signal[start + 1:stop], threshold, below=below)
+            return stop if i == -1 else start + 1 + i
+        else:
+            i = find_first_fast(signal[stop + 1:start][::-1], threshold, below=below)
+            return stop if i == -1 else start - 1 - i
+
     # Do the search
     i = start
     after_crossing_timer = 0
@@ -1051,9 +1074,7 @@ def find_next_crossing(signal, threshold,
                 # Todo: check if enough samples exist to compute slope..
                 try:
                     # Calculate the slope at this point using XeRawDP's '9-tap derivative kernel'
-                    log_slope = np.sum(signal[i - 4:i + 5] * np.array([
-                        -0.003059, -0.035187, -0.118739, -0.143928, 0.000000, 0.143928, 0.118739, 0.035187, 0.003059
-                    ])) / this_sample
+                    log_slope = np.dot(signal[i - 4:i + 5], XERAWDP_DERIVATIVE_KERNEL) / this_sample
                     # print("Slope is %s, threshold is %s" % (slope, slope_threshold))
                     # Left slopes of peaks are positive, so a negative slope indicates inversion
                     # If slope inversions are seen, return index of the minimum before this.
@@ -1072,6 +1093,18 @@ def find_next_crossing(signal, threshold,
         i += -1 if direction == 'left' else 1
 
 
+def find_first_fast(a, threshold, below=True, chunk_size=128):
+    """Returns index of first element in a below threshold (above if below=False), or -1 if there is none.
+    Compares chunk_size samples at a time, so we don't scan the whole array if the crossing is close by.
+    """
+    for i0 in range(0, len(a), chunk_size):
+        chunk = a[i0:i0 + chunk_size]
+        idx = np.flatnonzero(chunk < threshold if below else chunk > threshold)
+        if len(idx):
+            return int(idx[0]) + i0
+    return -1
+
+
 def interval_until_threshold(signal, start,
                              left_threshold, right_threshold=None, left_limit=0, right_limit=None,
                              min_crossing_length=1, stop_if_start_exceeded=False, activate_xerawdp_hacks_for=None
@@ -1187,10 +1220,10 @@ class Filtering(plugin.TransformPlugin):
                 # TODO: could be done more straightforwardly now that we've stored pulses properly
                 filter_length = len(f['impulse_response'])
 
-                # Determine the pulse boundaries
-                y = np.abs(np.sign(signal))
-                pbs = np.concatenate((np.where(np.roll(y, 1) - y == -1)[0],
-                                      np.where(np.roll(y, -1) - y == -1)[0]))
+                # Determine the pulse boundaries: first and last nonzero sample of each stretch of nonzero samples
+                d = np.diff((signal != 0).astype(np.int8))
+                pbs = np.concatenate((np.flatnonzero(d == 1) + 1,
+                                      np.flatnonzero(d == -1)))
 
                 # Check if these are real pulse boundaries: at least three samples before or after must be zero
                 real_pbs = []
@@ -270,7 +270,9 @@ class MongoDBReadUntriggered(plugin.InputPlugin, MongoBase):
             check_collection = self.input_collections[0]
 
         # Find the last pulse in the collection
-        cu = list(check_collection.find().sort('time', direction=pymongo.DESCENDING).limit(1))
+        # Only fetch the time field: the pulse data can be large, and we don't need it.
+        cu = list(check_collection.find(projection={'time': True, '_id': False}).sort(
+            'time', direction=pymongo.DESCENDING).limit(1))
         if not len(cu):
             if self.split_collections:
                 if not self.latest_subcollection == 0:
@@ -471,6 +473,7 @@ class MongoDBReadUntriggeredFiller(plugin.TransformPlugin, MongoBase):
     This is a separate plugin, since reading the raw pulse data is the expensive operation we want to parallelize.
     """
     do_input_check = False
+    pulse_doc_fields = {'time': True, 'module': True, 'channel': True, 'data': True, '_id': False}
 
     def startup(self):
         MongoBase.startup(self)
@@ -487,6 +490,18 @@ class MongoDBReadUntriggeredFiller(plugin.TransformPlugin, MongoBase):
         self.pmt_mappings = {(x['digitizer']['module'],
                               x['digitizer']['channel']): x['pmt_position'] for x in self.pmts}
 
+        # snappy releases the GIL, so we can decompress pulses in threads while the cursor fetches more data.
+        # A single pulse decompresses faster than a thread pool task is submitted, so we submit batches of pulses.
+        if self.input_info['compressed']:
+            self.decompression_executor = ThreadPoolExecutor(max_workers=self.config.get('decompression_workers', 4))
+        else:
+            self.decompression_executor = None
+        self.decompression_batch_size = self.config.get('decompression_batch_size', 1000)
+
+    def shutdown(self):
+        if self.decompression_executor is not None:
+            self.decompression_executor.shutdown()
+
     def _get_cursor_between_times(self, start, stop, subcollection_number=None):
         """Returns count, cursor over all pulses that start in [start, stop) (both pax units since start of run).
         Order of pulses is not defined.
@@ -503,7 +518,8 @@ class MongoDBReadUntriggeredFiller(plugin.TransformPlugin, MongoBase):
                 assert self.split_collections
                 collection = self.subcollection(subcollection_number, host_i)
             query = self.time_range_query(start, stop)
-            cursor = collection.find(query)
+            # Only fetch the fields we use, to keep the documents sent over the wire small
+            cursor = collection.find(query, projection=self.pulse_doc_fields)
             # Ask for a large batch size: the default is 101 documents or 1MB. This results in a very small speed
             # increase (when I measured it on a normal dataset)
             cursor.batch_size(int(1e7))
@@ -556,32 +572,48 @@ class MongoDBReadUntriggeredFiller(plugin.TransformPlugin, MongoBase):
         else:
             mongo_iterator = self._get_cursor_between_times(t0, t1)
 
-        data_is_compressed = self.input_info['compressed']
+        # Collect the pulses we want to keep. If the data is compressed, submit each full batch of pulses to the
+        # decompression thread pool immediately, so it overlaps with fetching the rest of the documents from the cursor.
+        pulses_data = []
+        payload_batches = []
+        current_batch = []
         for i, pulse_doc in enumerate(mongo_iterator):
             digitizer_id = (pulse_doc['module'], pulse_doc['channel'])
             pmt = self.pmt_mappings.get(digitizer_id)
             if pmt is not None:
-                # Fetch the raw data
-                data = pulse_doc['data']
-                if data_is_compressed:
-                    data = snappy.decompress(data)
-
+                current_batch.append(pulse_doc['data'])
+                if len(current_batch) == self.decompression_batch_size:
+                    payload_batches.append(self._decompress_batch(current_batch))
+                    current_batch = []
                 time_within_event = self._from_mt(pulse_doc['time']) - t0  # ns
-
-                event.pulses.append(Pulse(left=self._to_mt(time_within_event),
-                                          raw_data=np.fromstring(data,
-                                                                 dtype="<i2"),
-                                          channel=pmt,
-                                          do_it_fast=True))
+                pulses_data.append((self._to_mt(time_within_event), pmt))
             elif digitizer_id not in self.ignored_channels:
                 self.log.warning("Found data from digitizer module %d, channel %d,"
                                  "which doesn't exist according to PMT mapping! Ignoring...",
                                  pulse_doc['module'], pulse_doc['channel'])
                 self.ignored_channels.append(digitizer_id)
 
+        if len(current_batch):
+            payload_batches.append(self._decompress_batch(current_batch))
+        if self.decompression_executor is not None:
+            payload_batches = [batch.result() for batch in payload_batches]
+        payloads = (data for batch in payload_batches for data in batch)
+        for (left, pmt), data in zip(pulses_data, payloads):
+            # frombuffer gives a read-only view on the (decompressed) bytes, saving a copy of every pulse
+            event.pulses.append(Pulse(left=left,
+                                      raw_data=np.frombuffer(data, dtype="<i2"),
+                                      channel=pmt,
+                                      do_it_fast=True))
+
         self.log.debug("%d pulses in event %s" % (len(event.pulses), event.event_number))
         return event
 
+    def _decompress_batch(self, payloads):
+        """Return a future for the decompressed payloads if the data is compressed, else the payloads themselves"""
+        if self.decompression_executor is None:
+            return payloads
+        return self.decompression_executor.submit(decompress_pulses, payloads)
+
 
 class MongoDBClearUntriggered(plugin.TransformPlugin, MongoBase):
     """Clears data whose events have been built from MongoDB,
@@ -756,6 +788,11 @@ class MongoDBClearUntriggered(plugin.TransformPlugin, MongoBase):
                 executor.submit(db.drop_collection, collection_name)
 
 
+def decompress_pulses(payloads):
+    """Return list of snappy-decompressed payloads"""
+    return [snappy.decompress(data) for data in payloads]
+
+
 def pax_to_human_time(num):
     """Converts a pax time to a human-readable representation"""
     for x in ['ns', 'us', 'ms', 's', 'ks', 'Ms', 'G', 'T']:
@@ -804,8 +841,10 @@ def get_pulses(client_maker_config, input_info, collection_name, query, host, ge
         areas = np.zeros(0, dtype=np.float64)
 
     else:
-        # Concatenate results from multiple blocks, in case multiple blocks were needed
-        results = [np.concatenate([results[i][j]
+        # Concatenate results from multiple blocks, in case multiple blocks were needed.
+        # Even for a single block this copies the columns, so we don't keep monary's (huge) block buffers alive.
+        # Monary gives masked arrays: concatenate plain views of them, since numba can't handle masked arrays.
+        results = [np.concatenate([np.asarray(results[i][j])
                                    for i in range(len(results))])
                    for j in range(len(results[0]))]
 
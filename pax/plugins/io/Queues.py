@@ -1,5 +1,7 @@
+import gc
 import time
 import heapq
+import pickle
 
 from pax import plugin, utils, exceptions, datastructure
 from pax.parallel import queue, RabbitQueue, NO_MORE_EVENTS, REGISTER_PUSHER, PUSHER_DONE, DEFAULT_RABBIT_URI
@@ -16,6 +18,20 @@ def get_queue_from_config(config):
                            config.get('queue_url', DEFAULT_RABBIT_URI))
 
 
+def unpickle_without_gc(data):
+    """Unpickle data with the cyclic garbage collector switched off.
+    Unpickling an event block creates many container objects (events, pulses, peaks, ...), which would otherwise
+    trigger repeated collections that traverse the half-built block without ever finding garbage.
+    """
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return pickle.loads(data)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
 class PullFromQueue(plugin.InputPlugin):
     # We may get eventproxies rather than real events
     do_output_check = False
@@ -34,16 +50,19 @@ class PullFromQueue(plugin.InputPlugin):
         # If no message has been received for this amount of seconds, crash.
         self.timeout_after_sec = self.config.get('timeout_after_sec', float('inf'))
         self.max_blocks_on_heap = self.config.get('max_blocks_on_heap', 250)
+        # For ordered pulls, maximum number of ready blocks to move to the heap at once
+        self.max_blocks_per_drain = self.config.get('max_blocks_per_drain', 64)
 
-    def get_block(self):
+    def get_block(self, block=True):
         """Get a block of events from the queue, or raise queue.Empty if no events are available
+        If block, wait up to a second for a block to arrive.
         """
         if self.no_more_events:
             # There are no more events.
             # There could be stuff left on the queue, but then it's a None = NoMoreEvents message for other consumers.
             raise queue.Empty
 
-        head, body = self.queue.get(block=True, timeout=1)
+        head, body = self.queue.get(block=block, timeout=1)
 
         if head == NO_MORE_EVENTS:
             # The last event has been popped from the queue. Push None back on the queue for
@@ -57,21 +76,28 @@ class PullFromQueue(plugin.InputPlugin):
             # We're in a many-push to one-pull situation.
             # One of the pushers has just announced itself.
             self.pushers.append(body)
-            self.log.debug("Registered new pusher: %s" % body)
-            return self.get_block()
+            self.log.debug("Registered new pusher: %s", body)
+            return self.get_block(block)
 
         elif head == PUSHER_DONE:
             # A pusher just proclaimed it will no longer push events
             self.pushers.remove(body)
-            self.log.debug("Removed pusher: %s. %d remaining pushers" % (body, len(self.pushers)))
+            self.log.debug("Removed pusher: %s. %d remaining pushers", body, len(self.pushers))
             if not len(self.pushers):
-                # No pushers left, stop processing once there are no more events.
+                # No pushers left, so every block has already been received: stop processing once the heap is empty.
+                # No need to send a no more events message through the queue: many pushers can only push to one puller,
+                # so we're the only one who needs to know.
                 # This assumes all pushers will register before the first one is done!
-                self.queue.put((NO_MORE_EVENTS, None))
-            return self.get_block()
+                self.log.info("All pushers are done, no more events will arrive")
+                self.no_more_events = True
+                raise queue.Empty
+            return self.get_block(block)
 
         else:
             block_id, event_block = head, body
+            if isinstance(event_block, bytes):
+                # The pusher serialized the block itself (pickle_blocks option)
+                event_block = unpickle_without_gc(event_block)
 
         return block_id, event_block
 
@@ -80,6 +106,7 @@ class PullFromQueue(plugin.InputPlugin):
         block_id = -1
 
         while True:
+            poll_start = time.time()
             try:
                 if self.ordered_pull:
                     # We have to ensure the event blocks are pulled out in order.
@@ -95,15 +122,17 @@ class PullFromQueue(plugin.InputPlugin):
                                 "We have received over %d blocks without receiving the next block id (%d) in order. "
                                 "Likely one of the block producers has died without telling anyone." % (
                                     self.max_blocks_on_heap, block_id + 1))
-                        self.log.debug("Just got block %d, heap is now %d blocks long" % (
-                            new_block[0], len(block_heap)))
-                        self.log.debug("Earliest block: %d, looking for block %s" % (block_heap[0][0], block_id + 1))
+                        self.log.debug("Just got block %d, heap is now %d blocks long",
+                                       new_block[0], len(block_heap))
+                        self.log.debug("Earliest block: %d, looking for block %s", block_heap[0][0], block_id + 1)
 
                     # If we get here, we have the event block we need sitting at the top of the heap
                     block_id, event_block = heapq.heappop(block_heap)
 
                     assert block_id >= 0
 
+                    self.drain_ready_blocks()
+
                 else:
                     block_id, event_block = self.get_block()
 
@@ -116,13 +145,15 @@ class PullFromQueue(plugin.InputPlugin):
                     break
 
                 # The queue is empty so we must wait for the next event / The event we wan't hasn't arrived on the heap.
-                self.log.debug("Found empty queue, no more events is %s, len block heap is %s, sleeping for 1 sec" % (
-                    self.no_more_events, len(block_heap)))
+                self.log.debug("Found empty queue, no more events is %s, len block heap is %s, waiting",
+                               self.no_more_events, len(block_heap))
                 if len(block_heap) > 0.3 * self.max_blocks_on_heap:
-                    self.log.warning("%d blocks on heap, will crash if more than %d" % (len(block_heap),
-                                                                                        self.max_blocks_on_heap))
+                    self.log.warning("%d blocks on heap, will crash if more than %d",
+                                     len(block_heap), self.max_blocks_on_heap)
 
-                time.sleep(1)
+                # get_block already waited up to a second on queues that support blocking gets
+                # (but not on RabbitMQ queues, or once we know there are no more events): sleep for the rest of it.
+                time.sleep(max(0, 1 - (time.time() - poll_start)))
                 self.processor.timer.last_t = time.time()    # Time spent idling shouldn't count for the timing report
                 self.time_slept_since_last_response += 1
                 if self.time_slept_since_last_response > self.timeout_after_sec:
@@ -132,13 +163,25 @@ class PullFromQueue(plugin.InputPlugin):
 
                 continue
 
-            self.log.debug("Now processing block %d, %d events" % (block_id, len(event_block)))
-            for i, event in enumerate(event_block):
-                self.log.debug("Yielding event number %d" % event.event_number)
+            self.log.debug("Now processing block %d, %d events", block_id, len(event_block))
+            for event in event_block:
                 yield event
 
         self.log.debug("Exited get_events loop")
 
+    def drain_ready_blocks(self):
+        """Move blocks already waiting on the queue onto the block heap, without waiting for new ones.
+        This frees the queue (and the pipes of the processes pushing to it) while we process the current block.
+        Stops well before the heap could reach max_blocks_on_heap.
+        """
+        for _ in range(self.max_blocks_per_drain):
+            if len(self.block_heap) >= self.max_blocks_on_heap // 2:
+                break
+            try:
+                heapq.heappush(self.block_heap, self.get_block(block=False))
+            except queue.Empty:
+                break
+
     def shutdown(self):
         if hasattr(self.queue, 'close'):
             self.queue.close()
@@ -156,9 +199,16 @@ class PushToQueue(plugin.OutputPlugin):
         self.preserve_ids = self.config.get('preserve_ids', False)
         self.many_to_one = self.config.get('many_to_one', False)
 
+        # Pickle each block ourselves before putting it on the queue. A manager queue then only ferries a bytes
+        # string through the manager process, instead of unpickling and repickling every event in the block;
+        # a RabbitMQ or multiprocessing queue just repickles a bytes string.
+        self.pickle_blocks = self.config.get('pickle_blocks', False)
+
         # If we can't push a message due to a full queue for more than this number of seconds, crash
         # since probably the process responsible for pulling from the queue has died.
         self.timeout_after_sec = self.config.get('timeout_after_sec', float('inf'))
+        # Initial wait (in seconds) before rechecking a full queue. Doubles on each recheck, up to one second.
+        self.min_full_queue_sleep = self.config.get('min_full_queue_sleep', 0.01)
 
         if self.many_to_one:
             # Generate random name and tell the puller we're in town
@@ -168,6 +218,12 @@ class PushToQueue(plugin.OutputPlugin):
         self.current_block = []
         self.current_block_id = 0
 
+        # Upper bound on the queue size, if we are the only process pushing to the queue: only our own puts
+        # can grow it. While the bound is below max_queue_blocks we can skip asking the queue for its size,
+        # which for manager or RabbitMQ queues costs a round trip.
+        # Starts at the limit so the first send checks the actual size.
+        self.queue_size_bound = self.max_queue_blocks
+
     def write_event(self, event):
         if self.preserve_ids:
             # Someone else already set the block ids. Good for us.
@@ -184,9 +240,11 @@ class PushToQueue(plugin.OutputPlugin):
             # are immutable namedtuples.
             if isinstance(event, datastructure.EventProxy):
                 # Namedtuples are immutable, so we need to create a new event proxy with the same raw data
-                event = datastructure.make_event_proxy(event, data=event.data, block_id=self.current_block_id)
+                event = event._replace(block_id=self.current_block_id)
             else:
-                event.block_id = self.current_block_id
+                # current_block_id is always an int, like Event.block_id, so we can skip StrictModel's type checking.
+                # This runs for every event the input process reads.
+                object.__setattr__(event, 'block_id', self.current_block_id)
 
         self.current_block.append(event)
         # Send events once the max block size is reached. Do not wait until event with next id arrives:
@@ -204,15 +262,29 @@ class PushToQueue(plugin.OutputPlugin):
         """
         seconds_slept_with_queue_full = 0
         if len(self.current_block):
-            while self.queue.qsize() >= self.max_queue_blocks:
-                self.log.info("Max queue size %d reached, waiting to push block" % self.max_queue_blocks)
-                seconds_slept_with_queue_full += 1
-                time.sleep(1)
-                if seconds_slept_with_queue_full >= self.timeout_after_sec:
-                    raise exceptions.QueueTimeoutException(
-                        "Blocked from pushing to the queue for more than %s seconds; "
-                        "lost confidence we will ever be able to." % self.timeout_after_sec)
-            self.queue.put((self.current_block_id, self.current_block))
+            # Poll the queue size with an exponential backoff: a consumer that is only briefly behind
+            # frees a slot well within the first poll intervals, so we shouldn't idle for a whole second.
+            sleep_time = self.min_full_queue_sleep
+            queue_size = self.queue_size_bound
+            if self.many_to_one or queue_size >= self.max_queue_blocks:
+                queue_size = self.queue.qsize()
+                if queue_size >= self.max_queue_blocks:
+                    self.log.info("Max queue size %d reached, waiting to push block", self.max_queue_blocks)
+                while queue_size >= self.max_queue_blocks:
+                    time.sleep(sleep_time)
+                    seconds_slept_with_queue_full += sleep_time
+                    sleep_time = min(2 * sleep_time, 1)
+                    if seconds_slept_with_queue_full >= self.timeout_after_sec:
+                        raise exceptions.QueueTimeoutException(
+                            "Blocked from pushing to the queue for more than %s seconds; "
+                            "lost confidence we will ever be able to." % self.timeout_after_sec)
+                    queue_size = self.queue.qsize()
+            if self.pickle_blocks:
+                block = pickle.dumps(self.current_block, protocol=pickle.HIGHEST_PROTOCOL)
+            else:
+                block = self.current_block
+            self.queue.put((self.current_block_id, block))
+            self.queue_size_bound = queue_size + 1
         self.current_block = []
 
     def shutdown(self):
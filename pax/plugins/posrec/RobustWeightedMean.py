@@ -32,39 +32,43 @@ class PosRecRobustWeightedMean(plugin.PosRecPlugin):
         # Set fallback position: base class knows this means we gave up
         weighted_mean_position = None
 
+        # Instead of removing outlier PMTs from the arrays, we mark them dead and give them zero weight
+        pmt_locs = self.pmt_locations[pmts]
+        hitpattern = area_per_channel[pmts]
+        alive = np.ones(len(pmts), dtype=np.bool)
+
         while True:
-            # Get locations and hitpattern of remaining PMTs
-            pmt_locs = self.pmt_locations[pmts]
-            hitpattern = area_per_channel[pmts]
+            # Hitpattern of remaining PMTs
+            weights = hitpattern * alive
 
             # Rare case where somehow no pmts are contributing??
-            if np.sum(hitpattern) == 0:
+            if np.sum(weights) == 0:
                 break
 
             # Compute the weighted mean position (2-vector)
-            weighted_mean_position = np.average(pmt_locs, weights=hitpattern, axis=0)
+            weighted_mean_position = np.average(pmt_locs, weights=weights, axis=0)
 
             # Compute the Euclidean distance between PMTs and the wm position
             distances = np.sum((weighted_mean_position[np.newaxis, :] - pmt_locs)**2, axis=1)**0.5
 
             # Compute the weighted mean distance
-            wmd = np.average(distances, weights=hitpattern)
+            wmd = np.average(distances, weights=weights)
 
             # If there are no outliers, we are done
-            is_outlier = distances > wmd * self.outlier_threshold
+            is_outlier = alive & (distances > wmd * self.outlier_threshold)
             if not np.any(is_outlier):
                 break
 
-            if np.all(is_outlier):
+            if not np.any(alive & (True ^ is_outlier)):
                 # All are outliers... remove just the worst
-                pmts = np.delete(pmts, np.argmax(distances))
+                alive[np.argmax(np.where(alive, distances, -1))] = False
             else:
                 # Remove all outliers
-                pmts = pmts[True ^ is_outlier]
+                alive[is_outlier] = False
 
             # Give up if there are too few PMTs left
             # Don't put this as the while condition, want loop to run at least once
-            if len(pmts) <= self.config['min_pmts_left']:
+            if np.sum(alive) <= self.config['min_pmts_left']:
                 break
 
         return weighted_mean_position
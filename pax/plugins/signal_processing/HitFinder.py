@@ -54,6 +54,13 @@ class FindHits(plugin.TransformPlugin):
 
         self.always_find_single_hit = self.config.get('always_find_single_hit')
 
+        # Allocate numpy arrays to hold numba hitfinder results
+        # These are reused for every pulse in every event: only the part holding the hits found in the current
+        # pulse is ever read, and hits are copied out of hits_buffer.
+        # -1 is a placeholder for values that should never appear (0 would be bad as it often IS a possible value)
+        self.hit_bounds_buffer = -1 * np.ones((self.max_hits_per_pulse, 2), dtype=np.int64)
+        self.hits_buffer = np.zeros(self.max_hits_per_pulse, dtype=datastructure.Hit.get_dtype())
+
     def transform_event(self, event):
         dt = self.config['sample_duration']
         hits_per_pulse = []
@@ -61,10 +68,8 @@ class FindHits(plugin.TransformPlugin):
         left_extension = self.config['left_extension'] // dt
         right_extension = self.config['right_extension'] // dt
 
-        # Allocate numpy arrays to hold numba hitfinder results
-        # -1 is a placeholder for values that should never appear (0 would be bad as it often IS a possible value)
-        hit_bounds_buffer = -1 * np.ones((self.max_hits_per_pulse, 2), dtype=np.int64)
-        hits_buffer = np.zeros(self.max_hits_per_pulse, dtype=datastructure.Hit.get_dtype())
+        hit_bounds_buffer = self.hit_bounds_buffer
+        hits_buffer = self.hits_buffer
 
         for pulse_i, pulse in enumerate(event.pulses):
             start = pulse.left
@@ -10,28 +10,25 @@ class GroupTriggers(TriggerPlugin):
 
     def process(self, data):
         trigger_times = data.signals[data.signals['trigger']]['left_time']
-        event_ranges = []
-        left_ext = self.config['left_extension']
-        right_ext = self.config['right_extension']
         max_l = self.config['max_event_length']
-        truncated_events = 0
-        dead_time_due_to_truncation = 0
 
-        for group_of_tr in split_on_gap(trigger_times, self.config['event_separation']):
-            start = group_of_tr[0] - left_ext
-            stop = group_of_tr[-1] + right_ext
-            if stop - start > max_l:
-                self.log.warning("Event %d-%d too long (%0.2f ms), truncated to %0.2f ms. "
-                                 "Consider changing trigger settings!" % (start, stop,
-                                                                          (stop - start) / units.ms,
-                                                                          max_l / units.ms))
-                dead_time_due_to_truncation += stop - start - max_l
-                stop = start + max_l
-                truncated_events += 1
+        # Group triggers separated by less than event_separation, then extend the groups into event ranges.
+        # pax units are floats, so this arithmetic is done in floats; only the final event ranges become int64.
+        first_i, last_i = group_bounds(trigger_times, self.config['event_separation'])
+        starts = trigger_times[first_i] - self.config['left_extension']
+        stops = trigger_times[last_i] + self.config['right_extension']
 
-            event_ranges.append((start, stop))
+        too_long = stops - starts > max_l
+        for start, stop in zip(starts[too_long], stops[too_long]):
+            self.log.warning("Event %d-%d too long (%0.2f ms), truncated to %0.2f ms. "
+                             "Consider changing trigger settings!" % (start, stop,
+                                                                      (stop - start) / units.ms,
+                                                                      max_l / units.ms))
+        truncated_events = int(np.sum(too_long))
+        dead_time_due_to_truncation = float(np.sum(stops[too_long] - starts[too_long] - max_l))
+        stops[too_long] = starts[too_long] + max_l
 
-        data.event_ranges = np.array(event_ranges, dtype=np.int64)
+        data.event_ranges = np.column_stack((starts, stops)).astype(np.int64)
 
         data.batch_info_doc['truncated_events'] = truncated_events
         data.batch_info_doc['dead_time_due_to_truncation'] = dead_time_due_to_truncation
@@ -39,10 +36,9 @@ class GroupTriggers(TriggerPlugin):
         self.trigger.end_of_run_info['dead_time_due_to_truncation'] += dead_time_due_to_truncation
 
 
-def split_on_gap(a, threshold):
-    """Split a into list of arrays, each separated by threshold or more"""
+def group_bounds(a, threshold):
+    """Return (first indices, last indices) of groups in sorted array a, each separated by threshold or more"""
     if not len(a):
-        return []
-    if len(a) < 2:
-        return [a]
-    return np.split(a, np.where(np.diff(a) >= threshold)[0] + 1)
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    breaks = np.flatnonzero(np.diff(a) >= threshold)
+    return np.concatenate(([0], breaks + 1)), np.concatenate((breaks, [len(a) - 1]))
@@ -57,12 +57,8 @@ class HandleEdgeSignals(TriggerPlugin):
                 lookback_time = trigger_times[last_trigger_i + 1] - self.config['left_extension']
 
             # What is the last signal we can work with?
-            # TODO: Can be sped up by loop in numba. But probably doesn't matter much, should only run a few iterations.
-            i = 0
-            for i, t in enumerate(data.signals['left_time'][::-1]):
-                if t < lookback_time:
-                    break
-            last_ok_index = len(data.signals) - 1 - i
+            last_ok_index = find_last_before(times=data.signals['left_time'],
+                                             lookback_time=lookback_time)
             self.saved_signals = data.signals[last_ok_index + 1:]
             data.signals = data.signals[:last_ok_index + 1]
 
@@ -87,3 +83,16 @@ def find_last_break(times, last_time, break_time):
         else:
             last_time = t
     return -1
+
+
+@numba.jit(nopython=True)
+def find_last_before(times, lookback_time):
+    """Return the last index in times whose time is < lookback_time, searching backwards from the end.
+    If no such time exists, 0 is returned (the first entry is always kept), or -1 if times is empty.
+    """
+    imax = len(times) - 1
+    for _i in range(len(times)):
+        i = imax - _i
+        if times[i] < lookback_time:
+            return i
+    return min(0, imax)
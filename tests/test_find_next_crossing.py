@@ -0,0 +1,78 @@
+import unittest
+
+import numpy as np
+
+from pax.plugins.XerawdpImitation import find_next_crossing, find_first_fast
+
+
+class TestFindNextCrossing(unittest.TestCase):
+    """Check the vectorized search in find_next_crossing against the sample-by-sample search"""
+
+    def assertSameCrossing(self, signal, threshold, **kwargs):
+        fast = find_next_crossing(signal, threshold, **kwargs)
+        slow = find_next_crossing(signal, threshold, vectorized=False, **kwargs)
+        self.assertEqual(fast, slow, "Vectorized search gave %s, loop gave %s for %s" % (fast, slow, kwargs))
+        return fast
+
+    def test_random_signals(self):
+        rng = np.random.RandomState(0)
+        for _ in range(500):
+            # Integer-valued samples, so samples exactly equal to the threshold are common
+            signal = rng.randint(0, 10, size=rng.randint(2, 400)).astype(np.float64)
+            threshold = float(rng.randint(0, 10))
+            start = rng.randint(0, len(signal))
+            for direction in ('left', 'right'):
+                if direction == 'right':
+                    stops = [None, rng.randint(start, len(signal))]
+                else:
+                    stops = [None, rng.randint(0, start + 1)]
+                for stop in stops:
+                    self.assertSameCrossing(signal, threshold, start=start, direction=direction, stop=stop)
+
+    def test_equal_to_threshold_is_not_a_crossing(self):
+        signal = np.array([0, 5, 5, 10, 5, 0], dtype=np.float64)
+        self.assertEqual(self.assertSameCrossing(signal, 5, start=0, direction='right'), 3)
+        self.assertEqual(self.assertSameCrossing(signal, 5, start=5, direction='left'), 3)
+
+    def test_no_crossing(self):
+        signal = np.zeros(300)
+        self.assertEqual(self.assertSameCrossing(signal, 1, start=10, direction='right'), 299)
+        self.assertEqual(self.assertSameCrossing(signal, 1, start=290, direction='left'), 0)
+        self.assertEqual(self.assertSameCrossing(signal, 1, start=10, direction='right', stop=100), 100)
+        self.assertEqual(self.assertSameCrossing(signal, 1, start=290, direction='left', stop=100), 100)
+
+    def test_stop_bounds(self):
+        signal = np.zeros(100)
+        signal[50] = 10
+        # Crossing before, at and after the stop index
+        for stop, expected in ((60, 50), (50, 50), (40, 40)):
+            self.assertEqual(self.assertSameCrossing(signal, 5, start=10, direction='right', stop=stop), expected)
+        for stop, expected in ((40, 50), (50, 50), (60, 60)):
+            self.assertEqual(self.assertSameCrossing(signal, 5, start=90, direction='left', stop=stop), expected)
+
+    def test_chunk_boundaries(self):
+        # find_first_fast compares chunk_size samples at a time, starting from the sample after start
+        chunk_size = 128
+        start = 20
+        for offset in (chunk_size - 1, chunk_size, chunk_size + 1, 2 * chunk_size - 1, 2 * chunk_size):
+            signal = np.zeros(1000)
+            signal[start + 1 + offset] = 10
+            self.assertEqual(self.assertSameCrossing(signal, 5, start=start, direction='right'),
+                             start + 1 + offset)
+
+            signal = np.zeros(1000)
+            left_start = 900
+            signal[left_start - 1 - offset] = 10
+            self.assertEqual(self.assertSameCrossing(signal, 5, start=left_start, direction='left'),
+                             left_start - 1 - offset)
+
+    def test_find_first_fast(self):
+        a = np.arange(300, dtype=np.float64)
+        self.assertEqual(find_first_fast(a, 200, below=False), 201)
+        self.assertEqual(find_first_fast(a[::-1], 200, below=True), 100)
+        self.assertEqual(find_first_fast(a, -1, below=True), -1)
+        self.assertEqual(find_first_fast(a[:0], 0), -1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+import unittest
+
+import numpy as np
+
+from pax import utils
+from pax.InterpolatingMap import InterpolatingMap
+
+
+class TestInterpolatingMap(unittest.TestCase):
+
+    def setUp(self):  # noqa
+        self.map = InterpolatingMap(utils.data_file_name('XENON100_s2_xy_ly_xerawdp045.json'))
+
+    def test_get_values_matches_get_value(self):
+        positions = np.array([[0, 0], [3.2, -5.1], [-10, 12.5], [100, 100]], dtype=np.float64)
+        values = self.map.get_values(positions)
+        self.assertEqual(values.shape, (len(positions),))
+        for (x, y), v in zip(positions, values):
+            self.assertAlmostEqual(self.map.get_value(x, y), v)
+
+    def test_get_values_nan(self):
+        values = self.map.get_values([[0, 0], [float('nan'), 1]])
+        self.assertFalse(np.isnan(values[0]))
+        self.assertTrue(np.isnan(values[1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+
+import numpy as np
+
+from pax.plugins.io import MongoDB
+
+
+class FakeMonaryClient(object):
+    """Stand-in for a monary client, returning fixed blocks of column arrays from block_query"""
+
+    def __init__(self, blocks):
+        self.blocks = blocks
+
+    def block_query(self, database, collection, query, fields, types, **kwargs):
+        for block in self.blocks:
+            # Monary returns masked arrays, one per requested field
+            yield [np.ma.masked_array(column) for column in block[:len(fields)]]
+
+    def close(self):
+        pass
+
+
+class TestGetPulses(unittest.TestCase):
+
+    def setUp(self):
+        self.original_client_maker = MongoDB.ClientMaker
+
+    def tearDown(self):
+        MongoDB.ClientMaker = self.original_client_maker
+
+    def get_pulses(self, blocks, get_area=False):
+        class FakeClientMaker(object):
+            def __init__(self, config):
+                pass
+
+            def get_client(self, **kwargs):
+                return FakeMonaryClient(blocks)
+
+        MongoDB.ClientMaker = FakeClientMaker
+        return MongoDB.get_pulses(client_maker_config={},
+                                  input_info=dict(database='db', location='uri'),
+                                  collection_name='run', query={}, host='localhost', get_area=get_area)
+
+    @staticmethod
+    def make_block(times):
+        times = np.array(times, dtype=np.int64)
+        n = len(times)
+        return [times, np.zeros(n, dtype=np.int32), np.arange(n, dtype=np.int32), np.ones(n, dtype=np.float64)]
+
+    def test_single_block(self):
+        times, modules, channels, areas = self.get_pulses([self.make_block([10, 20, 30])])
+        np.testing.assert_array_equal(times, [10, 20, 30])
+        np.testing.assert_array_equal(channels, [0, 1, 2])
+        np.testing.assert_array_equal(areas, [0, 0, 0])
+        self.assertNotIsInstance(times, np.ma.MaskedArray)
+        # The columns must be copies, not views of monary's block buffers
+        self.assertTrue(times.flags.owndata)
+
+    def test_single_block_with_area(self):
+        times, modules, channels, areas = self.get_pulses([self.make_block([10, 20])], get_area=True)
+        np.testing.assert_array_equal(times, [10, 20])
+        np.testing.assert_array_equal(areas, [1, 1])
+
+    def test_multiple_blocks(self):
+        times, modules, channels, areas = self.get_pulses([self.make_block([10, 20]), self.make_block([30])])
+        np.testing.assert_array_equal(times, [10, 20, 30])
+        np.testing.assert_array_equal(channels, [0, 1, 0])
+        self.assertEqual(len(areas), 3)
+
+    def test_no_pulses(self):
+        times, modules, channels, areas = self.get_pulses([])
+        self.assertEqual(len(times), 0)
+        self.assertEqual(times.dtype, np.int64)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,6 @@
 import unittest
 import shutil
 import os
-from mock import MagicMock
 
 try:
     import queue
@@ -11,23 +10,30 @@ except ImportError:
 from pax.parallel import multiprocess_locally
 from pax.plugins.io.Queues import PullFromQueue, PushToQueue, NO_MORE_EVENTS, REGISTER_PUSHER, PUSHER_DONE
 from pax.datastructure import Event
+from pax.utils import Timer
+
+
+class FakeProcessor(object):
+    """Stand-in for pax.core.Processor with just the attributes the queue plugins use.
+    There is deliberately no catch-all attribute access: if a plugin starts using anything else from the processor,
+    these tests should fail loudly and the attribute should be added here.
+    """
+
+    def __init__(self):
+        self.timer = Timer()
+        self.input_plugin = None    # Read by OutputPlugin to choose a default output name
 
 
 def fake_events(n):
-    result = []
-    for i in range(n):
-        e = Event(n_channels=1, start_time=0, length=100, sample_duration=10)
-        e.event_number = i
-        e.block_id = i // 10
-        result.append(e)
-    return result
+    return [Event(n_channels=1, start_time=0, length=100, sample_duration=10, event_number=i, block_id=i // 10)
+            for i in range(n)]
 
 class TestMultiprocessing(unittest.TestCase):
 
     def test_ordered_pull(self):
         # Test pulling from a queue in order. Queue is here just a local (non-multiprocessing) queue
         q = queue.Queue()
-        p = PullFromQueue(dict(queue=q, ordered_pull=True), processor=MagicMock())
+        p = PullFromQueue(dict(queue=q, ordered_pull=True), processor=FakeProcessor())
         events = fake_events(20)
         q.put((2, events[20:]))
         q.put((0, events[:10]))
@@ -38,7 +44,7 @@ class TestMultiprocessing(unittest.TestCase):
 
     def test_pull_multiple(self):
         q = queue.Queue()
-        p = PullFromQueue(dict(queue=q, ordered_pull=True), processor=MagicMock())
+        p = PullFromQueue(dict(queue=q, ordered_pull=True), processor=FakeProcessor())
         events = fake_events(20)
         q.put((REGISTER_PUSHER, 'gast'))
         q.put((REGISTER_PUSHER, 'gozer'))
@@ -53,7 +59,7 @@ class TestMultiprocessing(unittest.TestCase):
     def test_push(self):
         # Test pushing to a local (non-multiprocessing) queue
         q = queue.Queue()
-        p = PushToQueue(dict(queue=q), processor=MagicMock())
+        p = PushToQueue(dict(queue=q), processor=FakeProcessor())
 
         # Submit a series of fake events, then shut down
         events = fake_events(22)
@@ -64,7 +70,7 @@ class TestMultiprocessing(unittest.TestCase):
         blocks_out = []
         try:
             while True:
-                blocks_out.append(q.get(timeout=1))
+                blocks_out.append(q.get_nowait())
         except queue.Empty:
             pass
 
@@ -80,7 +86,7 @@ class TestMultiprocessing(unittest.TestCase):
 
     def test_push_preserveid(self):
         q = queue.Queue()
-        p = PushToQueue(dict(queue=q, preserve_ids=True), processor=MagicMock())
+        p = PushToQueue(dict(queue=q, preserve_ids=True), processor=FakeProcessor())
 
         events = fake_events(22)
         for e in events:
@@ -90,7 +96,7 @@ class TestMultiprocessing(unittest.TestCase):
         blocks_out = []
         try:
             while True:
-                blocks_out.append(q.get(timeout=1))
+                blocks_out.append(q.get_nowait())
         except queue.Empty:
             pass
 
@@ -104,6 +110,17 @@ class TestMultiprocessing(unittest.TestCase):
         # Block sizes are correct
         self.assertEqual([len(x[1]) for x in blocks_out], [10, 10, 2])
 
+    def test_push_pull_pickled_blocks(self):
+        q = queue.Queue()
+        pusher = PushToQueue(dict(queue=q, pickle_blocks=True), processor=FakeProcessor())
+        for e in fake_events(22):
+            pusher.write_event(e)
+        pusher.shutdown()
+
+        puller = PullFromQueue(dict(queue=q, ordered_pull=True), processor=FakeProcessor())
+        event_numbers = [e.event_number for e in puller.get_events()]
+        self.assertEqual(event_numbers, list(range(22)))
+
     def test_multiprocessing(self):
         multiprocess_locally(n_cpus=2,
                              config_names='XENON100',
@@ -130,6 +130,20 @@ class TestGroupTriggers(unittest.TestCase):
 
         np.testing.assert_array_equal(data.event_ranges,
                                       np.array([[0, 1], [4, 5], [10, 10]], dtype=np.int))
+        self.assertEqual(data.event_ranges.dtype, np.int64)
+
+        # Extensions are usually given in (float) pax units, the event ranges must still be integers
+        tp.config.update(dict(left_extension=1 * units.ns, right_extension=2 * units.ns))
+        tp.process(data)
+        np.testing.assert_array_equal(data.event_ranges,
+                                      np.array([[-1, 3], [3, 7], [9, 12]], dtype=np.int64))
+        self.assertEqual(data.event_ranges.dtype, np.int64)
+
+        # Fractional extensions are applied before converting to integers, just like a single np.array(..., int64)
+        tp.config.update(dict(left_extension=1.5 * units.ns, right_extension=2.5 * units.ns))
+        tp.process(data)
+        np.testing.assert_array_equal(data.event_ranges,
+                                      np.array([[-1, 3], [2, 7], [8, 12]], dtype=np.int64))
 
 
 class TestTriggerIntegration(unittest.TestCase):